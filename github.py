@@ -101,25 +101,60 @@ def create_repo(token, repo, description=None, private=True, organization=None):
                         f"Response: \n{response.json()}")
 
 
-def list_repositories(token, organisation=None):
+def list_repositories(token, organisation=None,
+                      visibility=None, affiliation=None, repo_type=None,
+                      sort=None, direction=None, since=None, limit=None):
     """
     List repositories for the authenticated user.
 
+    All filter parameters are passed to the Github API, so only the requested
+    repositories are transferred. Parameters left to `None` use the API defaults.
+    `repo_type` is sent as the API parameter `type`.
+    For organisations `visibility` is sent as `type`; `affiliation` and `since`
+    aren't supported there and raise a `ValueError`.
+    `repo_type` can't be combined with `visibility` or `affiliation`.
+    `limit` (a positive number) stops after the first `limit` repositories;
+    `None` lists all repositories.
+
     https://docs.github.com/en/rest/repos/repos?apiVersion=2022-11-28#list-repositories-for-the-authenticated-user
+    https://docs.github.com/en/rest/repos/repos?apiVersion=2022-11-28#list-organization-repositories
     """
 
     # Pattern to match a value in the HTTP  header 'link'.
     # Example: <https://api.github.com/repositories/1300192/issues?page=4>; rel="next"
     nextPattern = "(?<=<)([\\S]*)(?=>; rel=\"next\")"
 
+    # Github answers with status code 422 otherwise
+    if repo_type is not None and (visibility is not None or affiliation is not None):
+        raise ValueError("Parameter 'repo_type' can't be combined with 'visibility' or 'affiliation'")
+
+    if limit is not None and limit <= 0:
+        raise ValueError(f"Parameter 'limit' must be a positive number: {limit}")
+
     if organisation:
+        if affiliation is not None or since is not None:
+            raise ValueError("Parameters 'affiliation' and 'since' aren't supported for organisations")
         url = baseurl + f"/orgs/{organisation}/repos"
+        # The organisation endpoint filters the visibility with 'type' (all, public, private)
+        if visibility is not None:
+            repo_type, visibility = visibility, None
     else:
         url = baseurl + "/user/repos"
 
+    params = {"visibility": visibility,
+              "affiliation": affiliation,
+              "type": repo_type,
+              "sort": sort,
+              "direction": direction,
+              "since": since,
+              # 100 is the maximum page size of the Github API
+              "per_page": min(limit, 100) if limit is not None else 100}
+    params = {key: value for key, value in params.items() if value is not None}
+
+    count = 0
     while True:
         response: requests.Response = requests.get(
-            url, headers={"Authorization": f"Bearer {token}"})
+            url, params=params, headers={"Authorization": f"Bearer {token}"})
 
         if response.status_code != 200:
             err_msg = ("Github-API Request fehlgeschlagen;\n\n"
@@ -130,10 +165,15 @@ def list_repositories(token, organisation=None):
 
         for repo in response.json():
             yield repo
+            count += 1
+            if limit is not None and count >= limit:
+                return
 
         if (m := re.search(nextPattern, response.headers.get('Link', ""), re.IGNORECASE)) and \
                 m is not None:
+            # The 'next' URL already contains all query parameters
             url = m.group(0)
+            params = None
         else:
             break
 
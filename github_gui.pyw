@@ -4,6 +4,7 @@ import os
 import pathlib
 import pprint
 import sys
+import time
 import webbrowser
 from datetime import datetime
 from pprint import pprint
@@ -19,8 +20,20 @@ GITHUB_OWNER = 'GITHUB_OWNER'
 GITHUB_TOTP = 'GITHUB_TOTP'
 
 
-def get_github_totp_token():
-    return os.environ.get(GITHUB_TOTP, None)
+def get_github_totp_secrets():
+    """
+    Returns the TOTP secrets from the environment variable 'GITHUB_TOTP' (named 'GITHUB')
+    and from all environment variables 'GITHUB_TOTP_<NAME>' (named '<NAME>', sorted by name).
+    'GITHUB_TOTP' always comes first; 'GITHUB_TOTP_GITHUB' keeps its full variable name.
+    """
+    secrets = {}
+    if GITHUB_TOTP in os.environ:
+        secrets["GITHUB"] = os.environ[GITHUB_TOTP]
+    prefix = GITHUB_TOTP + "_"
+    for key in sorted(k for k in os.environ if k.startswith(prefix)):
+        name = key[len(prefix):]
+        secrets[key if name in secrets else name] = os.environ[key]
+    return secrets
 
 
 def get_github_token():
@@ -41,15 +54,18 @@ class RepoLoaderThread(core.QThread):
     result = core.Signal(object)
     error = core.Signal(Exception)
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, **filters):
+        """
+        `filters` are passed to `github.list_repositories`.
+        """
         super().__init__()
         self._token = token
+        self._filters = filters
 
     @core.Slot()
     def run(self):
         try:
-            repos = list(github.list_repositories(self._token))
-            pprint(repos[0])
+            repos = list(github.list_repositories(self._token, **self._filters))
             self.result.emit(GithubRepositoriesModel(repos))
         except Exception as e:
             self.error.emit(e)
@@ -214,9 +230,23 @@ class TabRepositoriesTable(widgets.QWidget):
         self.setLayout(layout)
         layout.setSpacing(20)
 
+        layout_filter = widgets.QHBoxLayout()
+        layout.addLayout(layout_filter)
+
+        layout_filter.addWidget(widgets.QLabel("Visibility:"))
+        self.combo_visibility = widgets.QComboBox()
+        self.combo_visibility.addItems(["all", "public", "private"])
+        layout_filter.addWidget(self.combo_visibility)
+
+        layout_filter.addWidget(widgets.QLabel("Last pushed (0 = all):"))
+        self.spin_limit = widgets.QSpinBox()
+        self.spin_limit.setRange(0, 10000)
+        self.spin_limit.setValue(0)
+        layout_filter.addWidget(self.spin_limit)
+
         self.btn_load = widgets.QPushButton("Load")
         self.btn_load.clicked.connect(self.handler_btn_load_clicked)
-        layout.addWidget(self.btn_load)
+        layout_filter.addWidget(self.btn_load, 1)
 
         self.table = widgets.QTableView()
         self.table.setSortingEnabled(True)
@@ -296,7 +326,13 @@ class TabRepositoriesTable(widgets.QWidget):
         self._window.statusBar().showMessage("")
         if self.table.model():
             self.table.model().deleteLater()
-        self._thread = RepoLoaderThread(token)
+        # Last pushed repos should be displayed first; Github sorts them for us,
+        # so a limited view only transfers the requested repositories.
+        self._thread = RepoLoaderThread(token,
+                                        visibility=self.combo_visibility.currentText(),
+                                        sort="pushed",
+                                        direction="desc",
+                                        limit=self.spin_limit.value() or None)
         self._thread.result.connect(self.loading_repositories_finished)
         self._thread.error.connect(self.show_loading_error)
         self._thread.finished.connect(self._thread.deleteLater)
@@ -313,8 +349,6 @@ class TabRepositoriesTable(widgets.QWidget):
             self.btn_load.setEnabled(True)
             self._window.statusBar().showMessage(
                 f"{model.row_count()} repositories found on Github")
-            # Last pushed repos should be displayed first
-            model.sort_by(lambda r: r.date_pushed)
             self.table.setModel(TableModel(model))
             self.table.resizeColumnsToContents()
         except Exception as e:
@@ -332,8 +366,8 @@ class TabTOTP(widgets.QWidget):
         self._window = window
         self.setAutoFillBackground(True)
 
-        self._progress_last = None
-        self._totp_value = None
+        self._engine: totp.TOTPEngine = None
+        self._invalid_secrets: list[str] = []
 
         layout = widgets.QVBoxLayout()
         self.setLayout(layout)
@@ -355,6 +389,10 @@ class TabTOTP(widgets.QWidget):
         lbl.setAlignment(core.Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(lbl)
 
+        self.combo_secret = widgets.QComboBox()
+        self.combo_secret.currentTextChanged.connect(self.update_widgets)
+        layout.addWidget(self.combo_secret)
+
         btn = widgets.QPushButton("Copy")
         btn.clicked.connect(self.handler_copy_button_clicked)
         layout.addWidget(btn)
@@ -365,50 +403,63 @@ class TabTOTP(widgets.QWidget):
         self.lbl_totp.setFont(font)
         layout.addWidget(self.lbl_totp, 1, core.Qt.AlignmentFlag.AlignHCenter)
 
-        self.progressbar = widgets.QProgressBar()
-        self.progressbar.setMinimum(0)
-        self.progressbar.setMaximum(29)
-        layout.addWidget(self.progressbar)
+        self.lbl_valid_until = widgets.QLabel("")
+        self.lbl_valid_until.setAlignment(core.Qt.AlignmentFlag.AlignHCenter)
+        layout.addWidget(self.lbl_valid_until)
 
+        # Fires once at the beginning of each 30-second interval
         self.timer = core.QTimer()
-        self.timer.setInterval(1000)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(core.Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.handler_timeout)
-        self._count = 0
 
     def handler_copy_button_clicked(self):
         clipboard = gui.QClipboard()
-        clipboard.setText(self._totp_value)
+        clipboard.setText(self.lbl_totp.text())
 
     def update_widgets(self):
-        if self._totp_token is None:
+        name = self.combo_secret.currentText()
+        if self._engine is None or not name:
             return
-        progress_current = totp.get_progress()
-        self.progressbar.setValue(progress_current)
-        if self._progress_last != progress_current:
-            self._progress_last = progress_current
-            self._totp_value = totp.get_totp_token(self._totp_token)
-            self.lbl_totp.setText(self._totp_value)
+        # Read the clock once, so the TOTP and its expiry belong to the same interval
+        t = time.time()
+        self.lbl_totp.setText(self._engine.code(name, t))
+        valid_until = datetime.fromtimestamp(
+            totp.get_intervals_no(t) * totp.INTERVAL + totp.INTERVAL)
+        self.lbl_valid_until.setText(f"Valid until {valid_until:%H:%M:%S}")
+
+    def schedule_next_update(self):
+        # A few milliseconds late, so the timer never fires before the boundary
+        self.timer.start(int(totp.get_seconds_remaining() * 1000) + 5)
 
     def handler_timeout(self):
-        self._count += 1
         self.update_widgets()
-
-    # def event(self, event: core.QEvent):
-    #     print("TAB1", "event", event)
+        self.schedule_next_update()
 
     def showEvent(self, event: gui.QShowEvent):
-        print("TAB1", "showEvent", event)
         self._window.statusBar().showMessage("")
-        self._totp_token = get_github_totp_token()
-        if self._totp_token is None:
+        if self._engine is None:
+            secrets = get_github_totp_secrets()
+            if not secrets:
+                self._window.statusBar().showMessage(
+                    f"Environment variable '{GITHUB_TOTP}' not found. TOTP cannot be generated.")
+                return
+            # A malformed secret must not hide the codes of the valid ones
+            self._engine = totp.TOTPEngine()
+            for name, secret in secrets.items():
+                try:
+                    self._engine.add(name, secret)
+                except ValueError:
+                    self._invalid_secrets.append(name)
+            self.combo_secret.addItems(self._engine.names())
+            self.combo_secret.setVisible(len(self._engine) > 1)
+        if self._invalid_secrets:
             self._window.statusBar().showMessage(
-                f"Environment variable '{GITHUB_TOTP}' not found. TOTP cannot be generated.")
-            return
+                f"Invalid TOTP secrets skipped: {', '.join(self._invalid_secrets)}")
         self.update_widgets()
-        self.timer.start()
+        self.schedule_next_update()
 
     def hideEvent(self, event: gui.QHideEvent):
-        print("TAB1", "hideEvent", event)
         self.timer.stop()
 
 
@@ -0,0 +1,227 @@
+"""
+Mirror (clone or fetch) Github repositories to a local directory.
+
+Every repository is kept as a bare mirror in `<target_dir>/<owner>/<name>.git`.
+Missing repositories are cloned with `git clone --mirror`, existing ones are
+updated with `git fetch --prune`. The `git` subprocesses run on a bounded thread pool.
+
+The `pushed_at` value of every successfully mirrored repository is kept in a JSON
+state file. Repositories whose `pushed_at` hasn't changed since the last sync are skipped.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import base64
+import json
+import os
+import shutil
+import subprocess
+import time
+
+STATE_FILE_NAME = ".mirror_state.json"
+# Number of mirrored repositories after which the state file is written
+STATE_SAVE_INTERVAL = 20
+
+
+@dataclass
+class MirrorResult:
+    name: str
+    action: str  # "clone", "fetch" or "skip"
+    seconds: float
+    ok: bool
+    error: str = ""
+
+
+def load_state(state_file: str) -> dict:
+    """
+    Returns the mapping `full_name` -> `pushed_at` written by the last sync.
+    """
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_file: str, state: dict):
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, state_file)
+
+
+def get_mirror_path(target_dir: str, repo: dict) -> str:
+    return os.path.join(target_dir, repo['owner']['login'], repo['name'] + ".git")
+
+
+def get_auth_env(token: str) -> dict:
+    """
+    Returns environment variables which make git send `token` with every HTTP request.
+
+    The header is passed as git config in the environment, so the token shows up neither
+    in the process list nor in the remote URL stored in the mirror.
+    """
+    credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+    return {"GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "http.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}"}
+
+
+def run_git(args: list[str], extra_env: dict = None, timeout: float = None):
+    # Never wait for a password prompt; a missing credential is reported as an error.
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0", **(extra_env or {}))
+    try:
+        completed = subprocess.run(["git", *args], env=env, timeout=timeout,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except subprocess.TimeoutExpired:
+        raise Exception(f"'git {' '.join(args)}' timed out after {timeout} seconds")
+    if completed.returncode != 0:
+        raise Exception(f"'git {' '.join(args)}' failed with exit code {completed.returncode}:\n"
+                        f"{completed.stderr.strip()}")
+
+
+def is_mirror(path: str) -> bool:
+    """
+    Returns True if `path` is a git repository with the remote 'origin',
+    i.e. not an incomplete clone left behind by an interrupted sync.
+    """
+    try:
+        # '--git-dir' makes git check `path` itself, not a repository containing it
+        run_git(["--git-dir", path, "config", "--get", "remote.origin.url"])
+        return True
+    except Exception:
+        return False
+
+
+def mirror_repository(repo: dict, path: str, clone_url: str, extra_env: dict = None,
+                      git_timeout: float = None) -> MirrorResult:
+    """
+    Clones `clone_url` into `path` if `path` isn't a mirror yet, otherwise fetches it.
+    An incomplete clone in `path` is removed and cloned again.
+    """
+    action = "fetch" if os.path.isdir(path) and is_mirror(path) else "clone"
+    start = time.perf_counter()
+    try:
+        if action == "clone":
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            run_git(["clone", "--mirror", "--quiet", clone_url, path], extra_env, git_timeout)
+        else:
+            run_git(["-C", path, "fetch", "--prune", "--quiet", "origin"], extra_env, git_timeout)
+        return MirrorResult(repo['full_name'], action, time.perf_counter() - start, True)
+    except Exception as e:
+        return MirrorResult(repo['full_name'], action, time.perf_counter() - start, False, str(e))
+
+
+def mirror_repositories(repos, target_dir: str, state_file: str = None,
+                        max_workers: int = 8, clone_url_fn=None,
+                        token: str = None, git_timeout: float = None) -> list[MirrorResult]:
+    """
+    Mirrors all `repos` (dictionaries as returned by `github.list_repositories`) to `target_dir`.
+
+    `state_file` defaults to `<target_dir>/.mirror_state.json`.
+    `clone_url_fn(repo)` returns the URL to clone from; defaults to `repo['clone_url']`.
+    `token` authenticates git, so private repositories of collaborators and
+    organisations can be mirrored as well.
+    `git_timeout` is the maximum number of seconds a single clone or fetch may take;
+    a stalled git process is killed and its repository reported as failed.
+
+    Returns one `MirrorResult` per repository. Failed repositories don't stop the others
+    and aren't recorded in the state file, so they are retried by the next sync.
+    """
+    if state_file is None:
+        state_file = os.path.join(target_dir, STATE_FILE_NAME)
+    if clone_url_fn is None:
+        clone_url_fn = lambda repo: repo['clone_url']
+
+    extra_env = get_auth_env(token) if token else None
+
+    os.makedirs(target_dir, exist_ok=True)
+    state = load_state(state_file)
+    results = []
+
+    # The state is saved regularly during the sync and once more at the end,
+    # so an interrupted sync doesn't lose the progress made so far.
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for repo in repos:
+                path = get_mirror_path(target_dir, repo)
+                if state.get(repo['full_name']) == repo['pushed_at'] and os.path.isdir(path):
+                    results.append(MirrorResult(repo['full_name'], "skip", 0.0, True))
+                    continue
+                future = executor.submit(mirror_repository, repo, path, clone_url_fn(repo),
+                                         extra_env, git_timeout)
+                futures[future] = repo
+
+            unsaved = 0
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if result.ok:
+                    state[result.name] = futures[future]['pushed_at']
+                    unsaved += 1
+                if unsaved >= STATE_SAVE_INTERVAL:
+                    save_state(state_file, state)
+                    unsaved = 0
+    finally:
+        save_state(state_file, state)
+    return results
+
+
+def print_report(results: list[MirrorResult]):
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        status = "OK" if r.ok else "FAILED"
+        print(f"{r.seconds:8.2f}s  {r.action:5}  {status:6}  {r.name}")
+        if r.error:
+            print(f"          {r.error}")
+    failed = sum(1 for r in results if not r.ok)
+    skipped = sum(1 for r in results if r.action == "skip")
+    print(f"{len(results)} repositories: {len(results) - failed - skipped} mirrored, "
+          f"{skipped} unchanged, {failed} failed.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def positive_int(value):
+        number = int(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be a positive number: {value}")
+        return number
+
+    parser = argparse.ArgumentParser(
+        description="Mirror all Github repositories of the authenticated user to a local directory.")
+    parser.add_argument("target_dir")
+    parser.add_argument("--organisation", default=None)
+    parser.add_argument("--state-file", default=None)
+    parser.add_argument("--workers", type=positive_int, default=8)
+    parser.add_argument("--git-timeout", type=positive_int, default=3600,
+                        help="Maximum seconds for a single clone or fetch (default: 3600)")
+    parser.add_argument("--visibility", choices=["all", "public", "private"])
+    parser.add_argument("--affiliation",
+                        help="Comma-separated list of 'owner', 'collaborator', 'organization_member'")
+    parser.add_argument("--type")
+    parser.add_argument("--since", help="Only repositories updated after this ISO 8601 timestamp")
+    parser.add_argument("--limit", type=positive_int, help="Only the last pushed LIMIT repositories")
+    args = parser.parse_args()
+    if args.type and (args.visibility or args.affiliation):
+        parser.error("argument --type: not allowed with --visibility or --affiliation")
+    if args.organisation and (args.affiliation or args.since):
+        parser.error("arguments --affiliation and --since: not allowed with --organisation")
+
+    from github import list_repositories
+
+    token = os.environ['GITHUB_TOKEN']
+    repos = list(list_repositories(token, args.organisation,
+                                   visibility=args.visibility,
+                                   affiliation=args.affiliation,
+                                   repo_type=args.type,
+                                   sort="pushed",
+                                   direction="desc",
+                                   since=args.since,
+                                   limit=args.limit))
+    results = mirror_repositories(repos, args.target_dir, args.state_file, args.workers,
+                                  token=token, git_timeout=args.git_timeout)
+    print_report(results)
+    if any(not r.ok for r in results):
+        raise SystemExit(1)
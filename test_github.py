@@ -0,0 +1,87 @@
+"""
+Query parameters and paging of `list_repositories`, with `requests.get` replaced by two fake pages.
+"""
+import pytest
+
+import github
+
+NEXT_URL = "https://api.github.com/user/repos?page=2"
+
+
+class FakeResponse:
+    def __init__(self, repos, next_url=None):
+        self.status_code = 200
+        self.text = ""
+        self._repos = repos
+        self.headers = {'Link': f'<{next_url}>; rel="next"'} if next_url else {}
+
+    def json(self):
+        return self._repos
+
+
+@pytest.fixture
+def requests_get(monkeypatch):
+    """
+    Replaces `requests.get`; returns the list of (url, params) of all requests.
+    """
+    pages = {github.baseurl + "/user/repos": FakeResponse([{'name': "a"}, {'name': "b"}], NEXT_URL),
+             github.baseurl + "/orgs/org/repos": FakeResponse([{'name': "a"}]),
+             NEXT_URL: FakeResponse([{'name': "c"}, {'name': "d"}])}
+    calls = []
+
+    def get(url, params=None, headers=None):
+        calls.append((url, params))
+        return pages[url]
+
+    monkeypatch.setattr(github.requests, "get", get)
+    return calls
+
+
+def test_all_pages(requests_get):
+    repos = list(github.list_repositories("token"))
+    assert [r['name'] for r in repos] == ["a", "b", "c", "d"]
+    # The 'next' URL already contains the query parameters
+    assert requests_get == [(github.baseurl + "/user/repos", {'per_page': 100}),
+                            (NEXT_URL, None)]
+
+
+def test_filters_are_sent(requests_get):
+    list(github.list_repositories("token", visibility="private", affiliation="owner",
+                                  sort="pushed", direction="desc", since="2024-01-01T00:00:00Z"))
+    assert requests_get[0][1] == {'visibility': "private",
+                                  'affiliation': "owner",
+                                  'sort': "pushed",
+                                  'direction': "desc",
+                                  'since': "2024-01-01T00:00:00Z",
+                                  'per_page': 100}
+
+
+def test_limit_stops_early(requests_get):
+    repos = list(github.list_repositories("token", sort="pushed", limit=2))
+    assert [r['name'] for r in repos] == ["a", "b"]
+    assert requests_get == [(github.baseurl + "/user/repos", {'sort': "pushed", 'per_page': 2})]
+
+
+def test_limit_across_pages(requests_get):
+    repos = list(github.list_repositories("token", limit=3))
+    assert [r['name'] for r in repos] == ["a", "b", "c"]
+    assert len(requests_get) == 2
+
+
+def test_organisation_visibility_is_sent_as_type(requests_get):
+    list(github.list_repositories("token", "org", visibility="private"))
+    assert requests_get == [(github.baseurl + "/orgs/org/repos", {'type': "private", 'per_page': 100})]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'repo_type': "owner", 'visibility': "all"},
+    {'repo_type': "owner", 'affiliation': "owner"},
+    {'organisation': "org", 'affiliation': "owner"},
+    {'organisation': "org", 'since': "2024-01-01T00:00:00Z"},
+    {'limit': 0},
+    {'limit': -5},
+])
+def test_invalid_parameters(requests_get, kwargs):
+    with pytest.raises(ValueError):
+        list(github.list_repositories("token", **kwargs))
+    assert requests_get == []
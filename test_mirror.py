@@ -0,0 +1,87 @@
+"""
+Mirrors repositories from `file://` remotes: clone, skip, fetch and a failing remote.
+"""
+import os
+import subprocess
+
+import pytest
+
+import mirror
+
+
+def git(*args):
+    env = dict(os.environ,
+               GIT_AUTHOR_NAME="test", GIT_AUTHOR_EMAIL="test@example.com",
+               GIT_COMMITTER_NAME="test", GIT_COMMITTER_EMAIL="test@example.com")
+    subprocess.run(["git", *args], env=env, check=True, capture_output=True)
+
+
+def create_repo(path, name, pushed_at):
+    return {'name': name,
+            'full_name': f"me/{name}",
+            'owner': {'login': "me"},
+            'clone_url': path.as_uri(),
+            'pushed_at': pushed_at}
+
+
+def test_mirror_repositories(tmp_path):
+    source = tmp_path / "source"
+    git("init", "--quiet", str(source))
+    git("-C", str(source), "commit", "--quiet", "--allow-empty", "-m", "first")
+    target = tmp_path / "mirror"
+    state_file = str(target / mirror.STATE_FILE_NAME)
+
+    repo = create_repo(source, "source", "2024-01-01T00:00:00Z")
+    bad_repo = create_repo(tmp_path / "missing", "missing", "2024-01-01T00:00:00Z")
+
+    results = {r.name: r for r in mirror.mirror_repositories([repo, bad_repo], str(target))}
+    assert results["me/source"].action == "clone" and results["me/source"].ok
+    assert results["me/missing"].action == "clone" and not results["me/missing"].ok
+    assert results["me/missing"].error
+    assert mirror.load_state(state_file) == {"me/source": "2024-01-01T00:00:00Z"}
+
+    results = {r.name: r for r in mirror.mirror_repositories([repo], str(target))}
+    assert results["me/source"].action == "skip"
+
+    git("-C", str(source), "commit", "--quiet", "--allow-empty", "-m", "second")
+    repo['pushed_at'] = "2024-01-02T00:00:00Z"
+    results = {r.name: r for r in mirror.mirror_repositories([repo], str(target))}
+    assert results["me/source"].action == "fetch" and results["me/source"].ok
+    assert mirror.load_state(state_file) == {"me/source": "2024-01-02T00:00:00Z"}
+
+    mirrored = subprocess.run(["git", "-C", str(target / "me" / "source.git"), "log", "--format=%s"],
+                              check=True, capture_output=True, text=True)
+    assert mirrored.stdout.split() == ["second", "first"]
+
+
+def test_git_timeout(tmp_path, monkeypatch):
+    def run(args, timeout=None, **kwargs):
+        raise subprocess.TimeoutExpired(args, timeout)
+
+    monkeypatch.setattr(mirror.subprocess, "run", run)
+    repo = create_repo(tmp_path / "source", "source", "2024-01-01T00:00:00Z")
+    target = tmp_path / "mirror"
+
+    [result] = mirror.mirror_repositories([repo], str(target), git_timeout=5)
+    assert not result.ok
+    assert "timed out after 5 seconds" in result.error
+    assert mirror.load_state(str(target / mirror.STATE_FILE_NAME)) == {}
+
+
+@pytest.mark.parametrize("create_incomplete_clone", [
+    lambda path: (path / "HEAD").write_text("garbage"),
+    lambda path: git("init", "--quiet", "--bare", str(path)),
+])
+def test_incomplete_clone_is_cloned_again(tmp_path, create_incomplete_clone):
+    source = tmp_path / "source"
+    git("init", "--quiet", str(source))
+    git("-C", str(source), "commit", "--quiet", "--allow-empty", "-m", "first")
+    target = tmp_path / "mirror"
+    path = target / "me" / "source.git"
+    path.mkdir(parents=True)
+    create_incomplete_clone(path)
+
+    repo = create_repo(source, "source", "2024-01-01T00:00:00Z")
+    [result] = mirror.mirror_repositories([repo], str(target))
+    assert result.action == "clone" and result.ok
+    assert mirror.is_mirror(str(path))
@@ -0,0 +1,79 @@
+"""
+TOTPs of the RFC 6238 SHA-1 test vectors (last 6 of the 8 digits) and `TOTPEngine.verify`.
+
+https://datatracker.ietf.org/doc/html/rfc6238#appendix-B
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import totp
+
+# base32 of the ASCII secret "12345678901234567890"
+SECRET = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+
+RFC_6238_VECTORS = [
+    (59, "287082"),
+    (1111111109, "081804"),
+    (1111111111, "050471"),
+    (1234567890, "005924"),
+    (2000000000, "279037"),
+    (20000000000, "353130"),
+]
+
+
+@pytest.mark.parametrize("t, expected", RFC_6238_VECTORS)
+def test_engine_codes(t, expected):
+    engine = totp.TOTPEngine({"rfc": SECRET, "other": "JBSWY3DPEHPK3PXP"})
+    assert engine.code("rfc", t) == expected
+
+
+@pytest.mark.parametrize("t, expected", RFC_6238_VECTORS)
+def test_get_hotp_token(t, expected):
+    assert totp.format_token(totp.get_hotp_token(SECRET, totp.get_intervals_no(t))) == expected
+
+
+def test_verify_window():
+    engine = totp.TOTPEngine({"rfc": SECRET})
+    t = 1234567890
+    assert engine.verify("rfc", "005924", window=0, t=t)
+    assert engine.verify("rfc", "005924", window=1, t=t + totp.INTERVAL)
+    assert engine.verify("rfc", "005924", window=1, t=t - totp.INTERVAL)
+    assert not engine.verify("rfc", "005924", window=0, t=t + totp.INTERVAL)
+    assert not engine.verify("rfc", "005924", window=1, t=t + 2 * totp.INTERVAL)
+    assert not engine.verify("rfc", "000000", window=1, t=t)
+    assert not engine.verify("rfc", "äöüäöü", t=t)
+    assert not engine.verify("rfc", 5924, t=t)
+
+
+def test_codes_returns_copy():
+    engine = totp.TOTPEngine({"rfc": SECRET})
+    engine.codes(59)["rfc"] = "000000"
+    assert engine.code("rfc", 59) == "287082"
+
+
+@pytest.mark.parametrize("arg, expected", [
+    ("MFRGG===", (None, "MFRGG===")),
+    ("JBSWY3DPEHPK3PXP", (None, "JBSWY3DPEHPK3PXP")),
+    ("github=MFRGG===", ("github", "MFRGG===")),
+    ("=MFRGG", (None, "=MFRGG")),
+])
+def test_parse_secret_arg(arg, expected):
+    assert totp.parse_secret_arg(arg) == expected
+
+
+def test_main_single_padded_secret():
+    completed = subprocess.run([sys.executable, "totp.py", "MFRGG==="],
+                               cwd=os.path.dirname(os.path.abspath(totp.__file__)),
+                               capture_output=True, text=True, check=True)
+    label, code = completed.stdout.split()
+    assert label == "TOTP:"
+    assert totp.TOTPEngine({"padded": "MFRGG==="}).verify("padded", code, window=1)
+
+
+@pytest.mark.parametrize("secret", ["", "   ", "========"])
+def test_empty_secret(secret):
+    with pytest.raises(ValueError):
+        totp.TOTPEngine({"empty": secret})
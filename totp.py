@@ -1,5 +1,10 @@
 """
 Function `get_totp_token` generate time-based one-time (TOTP) password based on `secret`.
+
+Class `TOTPEngine` generates the TOTPs for many named secrets. The secrets are decoded
+once and the TOTPs are computed once per 30-second interval.
+
+Only the standard library is used, so this module can be imported without Qt or requests.
 """
 import base64
 import hashlib
@@ -7,18 +12,49 @@ import hmac
 import struct
 import time
 
+INTERVAL = 30
+DIGITS = 6
 
-def get_hotp_token(secret, intervals_no):
+
+def decode_secret(secret):
+    """
+    Decodes a base32-encoded `secret` (case insensitive, spaces and missing padding allowed).
+    """
+    secret = secret.replace(" ", "")
+    secret += "=" * (-len(secret) % 8)
     key = base64.b32decode(secret, True)
-    # decoding our key
-    msg = struct.pack(">Q", intervals_no)
+    # An empty key would still produce plausible-looking TOTPs
+    if not key:
+        raise ValueError("Secret is empty")
+    return key
+
+
+def get_hotp_value(key, intervals_no):
+    """
+    Parameter `key` is the decoded secret.
+    """
     # conversions between Python values and C structs represente
-    h = hmac.new(key, msg, hashlib.sha1).digest()
-    o = o = h[19] & 15
+    msg = struct.pack(">Q", intervals_no)
     # Generate a hash using both of these. Hashing algorithm is HMAC
-    h = (struct.unpack(">I", h[o:o+4])[0] & 0x7fffffff) % 1000000
+    h = hmac.new(key, msg, hashlib.sha1).digest()
+    o = h[19] & 15
     # unpacking
-    return h
+    return (struct.unpack(">I", h[o:o+4])[0] & 0x7fffffff) % 10**DIGITS
+
+
+def get_hotp_token(secret, intervals_no):
+    return get_hotp_value(decode_secret(secret), intervals_no)
+
+
+def format_token(value):
+    # adding 0 in the beginning till OTP has 6 digits
+    return str(value).zfill(DIGITS)
+
+
+def get_intervals_no(t=None):
+    if t is None:
+        t = time.time()
+    return int(t) // INTERVAL
 
 
 def get_progress():
@@ -26,7 +62,16 @@ def get_progress():
     Returns an integer number in range 0 - 29
     """
     t = int(time.time())
-    return t % 30
+    return t % INTERVAL
+
+
+def get_seconds_remaining(t=None):
+    """
+    Returns the seconds until the next 30-second interval begins.
+    """
+    if t is None:
+        t = time.time()
+    return INTERVAL - t % INTERVAL
 
 
 def get_totp_token(secret):
@@ -35,18 +80,105 @@ def get_totp_token(secret):
     Returns 6-digit time-based password/token.
     """
     # ensuring to give the same otp for 30 seconds
-    x = str(get_hotp_token(secret, intervals_no=int(time.time())//30))
-    # adding 0 in the beginning till OTP has 6 digits
-    while len(x) != 6:
-        x += '0'
-    return x  # base64 encoded key
+    return format_token(get_hotp_token(secret, intervals_no=get_intervals_no()))
+
+
+def parse_secret_arg(arg):
+    """
+    Splits a command line argument `<name>=<secret>` into `(name, secret)`.
+    Returns `(None, arg)` for a plain secret, which may end with `=` padding.
+    """
+    name, separator, _ = arg.rstrip("=").partition("=")
+    if separator and name:
+        return name, arg[len(name) + 1:]
+    return None, arg
+
+
+class TOTPEngine:
+    """
+    Generates TOTPs for many named base32-encoded secrets.
+
+    engine = TOTPEngine({"github": "JBSWY3DPEHPK3PXP"})
+    engine.codes() --> {"github": "123456"}
+    engine.verify("github", "123456", window=1) --> True
+    """
+
+    def __init__(self, secrets: dict[str, str] = None):
+        self._keys: dict[str, bytes] = {}
+        self._codes_intervals_no = None
+        self._codes: dict[str, str] = {}
+        for name, secret in (secrets or {}).items():
+            self.add(name, secret)
+
+    def add(self, name: str, secret: str):
+        self._keys[name] = decode_secret(secret)
+        self._codes_intervals_no = None
+
+    def remove(self, name: str):
+        del self._keys[name]
+        self._codes_intervals_no = None
+
+    def names(self) -> list[str]:
+        return list(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def codes(self, t=None) -> dict[str, str]:
+        """
+        Returns the TOTPs of all secrets for the interval containing `t` (default: now).
+        The TOTPs of the last requested interval are computed only once.
+        """
+        intervals_no = get_intervals_no(t)
+        if intervals_no == self._codes_intervals_no:
+            # A copy, so callers can't change the cached TOTPs
+            return dict(self._codes)
+        codes = {name: format_token(get_hotp_value(key, intervals_no))
+                 for name, key in self._keys.items()}
+        self._codes_intervals_no = intervals_no
+        self._codes = codes
+        return dict(codes)
+
+    def code(self, name: str, t=None) -> str:
+        return self.codes(t)[name]
+
+    def verify(self, name: str, code: str, window=1, t=None) -> bool:
+        """
+        Returns True if `code` is the TOTP of the secret `name` for the interval
+        containing `t` (default: now) or one of the `window` intervals before or after it.
+        """
+        # hmac.compare_digest raises TypeError for anything but ASCII strings
+        if not isinstance(code, str) or not code.isascii():
+            return False
+        key = self._keys[name]
+        intervals_no = get_intervals_no(t)
+        return any(hmac.compare_digest(format_token(get_hotp_value(key, i)), code)
+                   for i in range(intervals_no - window, intervals_no + window + 1))
 
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) != 2:
-        raise SystemExit("Secret token expected.")
+    usage = "USAGE: totp.py <secret> | <name>=<secret> [<name>=<secret> ...]"
+    if len(sys.argv) < 2:
+        raise SystemExit("Secret token expected.\n" + usage)
+
+    secrets = [parse_secret_arg(arg) for arg in sys.argv[1:]]
 
-    secret = sys.argv[1]
-    print("TOTP:", get_totp_token(secret))
+    if len(secrets) == 1 and secrets[0][0] is None:
+        try:
+            print("TOTP:", get_totp_token(secrets[0][1]))
+        except ValueError as e:
+            raise SystemExit(f"Invalid secret: {e}")
+    else:
+        engine = TOTPEngine()
+        for name, secret in secrets:
+            if name is None:
+                raise SystemExit(f"Name expected for secret '{secret}'.\n" + usage)
+            try:
+                engine.add(name, secret)
+            except ValueError as e:
+                raise SystemExit(f"Invalid secret '{name}': {e}")
+        for name, code in engine.codes().items():
+            print(f"{name}: {code}")
+        print(f"Valid for {get_seconds_remaining():.0f} seconds.")